@@ -6,7 +6,11 @@ import signal
 import logging
 import shutil
 import uuid
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import io
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing import shared_memory
 from flask import Flask, render_template, request, jsonify
 from werkzeug.utils import secure_filename
 import json
@@ -38,6 +42,27 @@ ENCODE_QUALITY_PRESETS = {
 
 SUPPORTED_SEQUENCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.exr')
 EXR_PREPROCESS_WORKERS = 4
+# 'shared_memory' streams decoded EXR frames straight into ffmpeg; 'png' writes temp PNG files first.
+EXR_FRAME_TRANSPORT = 'shared_memory'
+# Shared-memory frame slots in flight at once (bounds RAM to slots x frame size).
+EXR_SHARED_MEMORY_SLOTS = EXR_PREPROCESS_WORKERS * 2
+# Read-ahead for high-latency (NFS/SMB) storage, enabled per sequence with 'prefetch_frames'.
+FRAME_PREFETCH_THREADS = 8
+FRAME_PREFETCH_BYTE_BUDGET = 512 * 1024 * 1024
+# Folder holding .cube LUTs selectable per EXR AOV in the UI
+COLOR_LUT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'luts')
+# 3D LUT sampling: 'tetrahedral' or 'trilinear'
+COLOR_LUT_INTERPOLATION = 'tetrahedral'
+# Pixels per vectorized LUT lookup; bounds the size of temporary gather arrays.
+COLOR_LUT_CHUNK_PIXELS = 1 << 16
+# Per-AOV color transforms besides .cube files; 'auto' applies sRGB to Beauty only.
+BUILTIN_COLOR_TRANSFORMS = ('auto', 'none', 'srgb')
+# ffmpeg image2pipe decoder per image extension
+IMAGE_PIPE_CODECS = {
+    'png': 'png',
+    'jpg': 'mjpeg',
+    'jpeg': 'mjpeg',
+}
 
 # Global variables to store conversion state
 conversion_progress = {
@@ -56,6 +81,11 @@ current_process = {
     'should_stop': False
 }
 
+# Parsed .cube LUTs by path, reused across jobs while the file is unchanged
+cube_lut_cache = {}
+# Color transform installed in each EXR worker process by the pool initializer
+worker_color_transform = None
+
 def add_log_message(message):
     """Add a message to the log history"""
     conversion_progress['current_message'] = message
@@ -93,6 +123,139 @@ def get_first_frame_path(sequence_info):
         sequence_info['pattern'] % sequence_info['start_frame']
     )
 
+def get_sequence_frame_paths(sequence_info):
+    return [
+        os.path.join(sequence_info['folder'], sequence_info['pattern'] % frame_number)
+        for frame_number in range(
+            sequence_info['start_frame'],
+            sequence_info['start_frame'] + sequence_info['count']
+        )
+    ]
+
+class PrefetchedFrame:
+    """One frame file read ahead by FramePrefetcher.
+
+    Holds the contents either as `data` (bytes) or, for process-pool
+    consumers, in a shared-memory `buffer` whose first `size` bytes are the file.
+    """
+
+    def __init__(self, path, size, data=None, buffer=None):
+        self.path = path
+        self.size = size
+        self.data = data
+        self.buffer = buffer
+
+    def close(self):
+        self.data = None
+        if self.buffer is not None:
+            try:
+                self.buffer.close()
+                self.buffer.unlink()
+            except FileNotFoundError:
+                pass
+            self.buffer = None
+
+def read_file_bytes(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return PrefetchedFrame(path, len(data), data=data)
+
+def read_file_to_shared_memory(path):
+    """Read a file straight into a new shared-memory buffer."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            read_total = 0
+            with buffer.buf[:size] as view:
+                while read_total < size:
+                    read_count = f.readinto(view[read_total:])
+                    if not read_count:
+                        break
+                    read_total += read_count
+        except Exception:
+            buffer.close()
+            buffer.unlink()
+            raise
+    return PrefetchedFrame(path, read_total, buffer=buffer)
+
+class FramePrefetcher:
+    """Iterate over frame file contents in order, reading ahead on a thread pool.
+
+    Up to `threads` files are opened concurrently so per-file latency on
+    network mounts overlaps. Read-ahead depth shrinks as frames handed out
+    but not yet release()d use up `byte_budget`; at least one frame is
+    always read ahead so the consumer cannot stall. Consumers that hold
+    several frames at once (the EXR feeder) must also stop pulling while
+    has_budget_for_next_frame() is false. With `shared_memory_buffers`,
+    frames are read into shared memory so process-pool workers can attach
+    to them by name.
+    """
+
+    def __init__(self, paths, threads=FRAME_PREFETCH_THREADS, byte_budget=FRAME_PREFETCH_BYTE_BUDGET,
+                 shared_memory_buffers=False):
+        self.paths = list(paths)
+        self.threads = max(1, threads)
+        self.byte_budget = byte_budget
+        self.read_frame = read_file_to_shared_memory if shared_memory_buffers else read_file_bytes
+        # Bytes handed out by the iterator and not yet released
+        self.held_bytes = 0
+        # Largest frame seen so far; used to turn the byte budget into a frame count.
+        self.largest_frame_bytes = 0
+
+    def has_budget_for_next_frame(self):
+        return self.held_bytes + self.largest_frame_bytes <= self.byte_budget
+
+    def release(self, frame):
+        self.held_bytes -= frame.size
+        frame.close()
+
+    def __iter__(self):
+        pending = deque()
+        next_index = 0
+        executor = ThreadPoolExecutor(max_workers=self.threads)
+        try:
+            while next_index < len(self.paths) or pending:
+                if self.largest_frame_bytes:
+                    max_pending = max(1, (self.byte_budget - self.held_bytes) // self.largest_frame_bytes)
+                else:
+                    max_pending = self.threads
+                while next_index < len(self.paths) and len(pending) < max_pending:
+                    pending.append(executor.submit(self.read_frame, self.paths[next_index]))
+                    next_index += 1
+
+                frame = pending.popleft().result()
+                self.largest_frame_bytes = max(self.largest_frame_bytes, frame.size)
+                self.held_bytes += frame.size
+                yield frame
+        finally:
+            for pending_future in pending:
+                pending_future.cancel()
+            executor.shutdown(wait=True)
+            # Free reads that finished after the consumer stopped iterating.
+            for pending_future in pending:
+                if not pending_future.cancelled() and pending_future.exception() is None:
+                    pending_future.result().close()
+
+def log_prefetch_settings():
+    add_log_message(
+        f"Prefetching frames with {FRAME_PREFETCH_THREADS} reader thread(s), "
+        f"{FRAME_PREFETCH_BYTE_BUDGET // (1024 * 1024)} MB read-ahead budget"
+    )
+
+def feed_prefetched_frames(stream, frame_paths):
+    """Write frame files to stream in order, as read ahead by a FramePrefetcher."""
+    prefetcher = FramePrefetcher(frame_paths)
+    prefetched = iter(prefetcher)
+    try:
+        for frame in prefetched:
+            if current_process['should_stop']:
+                return
+            stream.write(frame.data)
+            prefetcher.release(frame)
+    finally:
+        prefetched.close()
+
 def parse_pattern_padding(pattern):
     match = re.search(r'%0(\d+)d', pattern)
     if match:
@@ -182,12 +345,225 @@ def linear_to_srgb(rgb_linear):
         1.055 * np.power(rgb_linear, 1.0 / 2.4) - 0.055
     )
 
-def convert_exr_frame_to_png(exr_path, png_path, aov_spec, aov_name):
+def parse_cube_lut(path):
+    """Parse a 1D and/or 3D .cube LUT into float32 NumPy tables.
+
+    The 3D table keeps the file's row order (red changes fastest), so entry
+    (r, g, b) lives at flat index r + g * size + b * size * size.
+    """
+    size_1d = size_3d = None
+    domain_min = [0.0, 0.0, 0.0]
+    domain_max = [1.0, 1.0, 1.0]
+    range_1d = range_3d = None
+    rows = []
+
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            parts = line.split('#', 1)[0].split()
+            if not parts:
+                continue
+            keyword = parts[0].upper()
+            try:
+                if keyword == 'LUT_1D_SIZE':
+                    size_1d = int(parts[1])
+                elif keyword == 'LUT_3D_SIZE':
+                    size_3d = int(parts[1])
+                elif keyword == 'DOMAIN_MIN':
+                    domain_min = [float(value) for value in parts[1:4]]
+                elif keyword == 'DOMAIN_MAX':
+                    domain_max = [float(value) for value in parts[1:4]]
+                elif keyword == 'LUT_1D_INPUT_RANGE':
+                    range_1d = [float(parts[1])] * 3, [float(parts[2])] * 3
+                elif keyword == 'LUT_3D_INPUT_RANGE':
+                    range_3d = [float(parts[1])] * 3, [float(parts[2])] * 3
+                elif keyword[0].isalpha():
+                    # TITLE and vendor-specific keywords do not affect the transform.
+                    continue
+                elif len(parts) != 3:
+                    raise ValueError(f"expected 3 values, got {len(parts)}")
+                else:
+                    rows.append([float(value) for value in parts])
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"Invalid .cube line in {path}: {line.strip()} ({e})")
+
+    if size_1d is None and size_3d is None:
+        raise ValueError(f"No LUT_1D_SIZE or LUT_3D_SIZE in {path}")
+    if any(size is not None and size < 2 for size in (size_1d, size_3d)):
+        raise ValueError(f"LUT size must be at least 2 in {path}")
+    expected_rows = (size_1d or 0) + (size_3d ** 3 if size_3d else 0)
+    if len(rows) != expected_rows:
+        raise ValueError(f"Expected {expected_rows} RGB entries in {path}, found {len(rows)}")
+
+    table = np.asarray(rows, dtype=np.float32)
+    lut = {
+        'path': path,
+        'table_1d': None,
+        'domain_1d': None,
+        'size_3d': size_3d,
+        'table_3d': None,
+        'domain_3d': None,
+    }
+    # When both are present (Resolve style), the 1D shaper rows come first.
+    if size_1d:
+        lut['table_1d'] = table[:size_1d]
+        lut['domain_1d'] = compile_lut_domain(*(range_1d or (domain_min, domain_max)), size=size_1d)
+    if size_3d:
+        lut['table_3d'] = np.ascontiguousarray(table[size_1d or 0:])
+        lut['domain_3d'] = compile_lut_domain(*(range_3d or (domain_min, domain_max)), size=size_3d)
+    return lut
+
+def compile_lut_domain(domain_min, domain_max, size):
+    """Return (offset, scale) mapping input values onto [0, size - 1] LUT coordinates."""
+    domain_min = np.asarray(domain_min, dtype=np.float32)
+    domain_max = np.asarray(domain_max, dtype=np.float32)
+    if domain_min.shape != (3,) or np.any(domain_max <= domain_min):
+        raise ValueError("Invalid .cube LUT domain")
+    return domain_min, np.float32(size - 1) / (domain_max - domain_min)
+
+def load_cube_lut(path):
+    """Return the compiled LUT for path, parsing it again only when the file changed."""
+    stat = os.stat(path)
+    cache_key = (stat.st_mtime_ns, stat.st_size)
+    cached = cube_lut_cache.get(path)
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    lut = parse_cube_lut(path)
+    cube_lut_cache[path] = (cache_key, lut)
+    return lut
+
+def list_cube_luts():
+    if not os.path.isdir(COLOR_LUT_FOLDER):
+        return []
+    return sorted(
+        name for name in os.listdir(COLOR_LUT_FOLDER)
+        if name.lower().endswith('.cube') and os.path.isfile(os.path.join(COLOR_LUT_FOLDER, name))
+    )
+
+def lut_coordinates(pixels, domain, size):
+    """Return planar (3, N) lower lattice indices and fractional offsets for (N, 3) pixels."""
+    offset, scale = domain
+    scaled = np.clip((pixels - offset) * scale, 0.0, size - 1)
+    index = np.minimum(scaled.astype(np.int32), size - 2)
+    frac = scaled - index.astype(np.float32)
+    # Planar channels keep the per-pixel arithmetic below on contiguous arrays.
+    return np.ascontiguousarray(index.T), np.ascontiguousarray(frac.T)
+
+def apply_lut_1d(pixels, table, domain):
+    index, frac = lut_coordinates(pixels, domain, table.shape[0])
+    result = np.empty_like(pixels)
+    for channel in range(3):
+        low = np.take(table[:, channel], index[channel])
+        high = np.take(table[:, channel], index[channel] + 1)
+        result[:, channel] = low + (high - low) * frac[channel]
+    return result
+
+def apply_lut_3d(pixels, table, size, domain, interpolation):
+    index, (fr, fg, fb) = lut_coordinates(pixels, domain, size)
+    r_step, g_step, b_step = 1, size, size * size
+    base = index[0] + index[1] * g_step + index[2] * b_step
+
+    def corner(offset):
+        return np.take(table, base + offset, axis=0)
+
+    if interpolation == 'trilinear':
+        fr, fg, fb = fr[:, None], fg[:, None], fb[:, None]
+        c000 = corner(0)
+        c100 = corner(r_step)
+        c010 = corner(g_step)
+        c110 = corner(g_step + r_step)
+        c001 = corner(b_step)
+        c101 = corner(b_step + r_step)
+        c011 = corner(b_step + g_step)
+        c111 = corner(b_step + g_step + r_step)
+        c00 = c000 + (c100 - c000) * fr
+        c10 = c010 + (c110 - c010) * fr
+        c01 = c001 + (c101 - c001) * fr
+        c11 = c011 + (c111 - c011) * fr
+        c0 = c00 + (c10 - c00) * fg
+        c1 = c01 + (c11 - c01) * fg
+        return c0 + (c1 - c0) * fb
+
+    # Tetrahedral: walk from the lower corner to the upper one along the axes in
+    # order of decreasing fractional offset, weighting the 4 visited corners.
+    r_is_max = (fr >= fg) & (fr >= fb)
+    b_is_min = (fb <= fr) & (fb <= fg)
+    max_step = np.where(r_is_max, r_step, np.where(fg >= fb, g_step, b_step))
+    min_step = np.where(b_is_min, b_step, np.where(fg <= fr, g_step, r_step))
+    frac_max = np.maximum(np.maximum(fr, fg), fb)
+    frac_min = np.minimum(np.minimum(fr, fg), fb)
+    frac_mid = fr + fg + fb - frac_max - frac_min
+    all_steps = r_step + g_step + b_step
+    result = corner(0) * (1.0 - frac_max)[:, None]
+    result += corner(max_step) * (frac_max - frac_mid)[:, None]
+    result += corner(all_steps - min_step) * (frac_mid - frac_min)[:, None]
+    result += corner(all_steps) * frac_min[:, None]
+    return result
+
+def apply_cube_lut(rgb, lut, interpolation=COLOR_LUT_INTERPOLATION):
+    """Apply a compiled .cube LUT to a float32 (height, width, 3) image."""
+    pixels = np.ascontiguousarray(rgb, dtype=np.float32).reshape(-1, 3)
+    result = np.empty_like(pixels)
+    for start in range(0, len(pixels), COLOR_LUT_CHUNK_PIXELS):
+        chunk = pixels[start:start + COLOR_LUT_CHUNK_PIXELS]
+        if lut['table_1d'] is not None:
+            chunk = apply_lut_1d(chunk, lut['table_1d'], lut['domain_1d'])
+        if lut['table_3d'] is not None:
+            chunk = apply_lut_3d(chunk, lut['table_3d'], lut['size_3d'], lut['domain_3d'], interpolation)
+        result[start:start + COLOR_LUT_CHUNK_PIXELS] = chunk
+    return result.reshape(rgb.shape)
+
+def resolve_color_transform(choice, aov_name):
+    """Return the color transform for an AOV from its choice: 'auto', 'none', 'srgb' or a .cube file name."""
+    if not choice or choice == 'auto':
+        # Beauty is usually stored in linear space, so convert to display-referred sRGB.
+        choice = 'srgb' if str(aov_name).lower() == 'beauty' else 'none'
+    if choice in BUILTIN_COLOR_TRANSFORMS:
+        return {'type': choice, 'label': choice}
+    lut_path = os.path.join(COLOR_LUT_FOLDER, os.path.basename(choice))
+    return {
+        'type': 'lut',
+        'label': f"{choice} ({COLOR_LUT_INTERPOLATION})",
+        'lut': load_cube_lut(lut_path),
+        'interpolation': COLOR_LUT_INTERPOLATION,
+    }
+
+def apply_color_transform(rgb, color_transform):
+    if not color_transform or color_transform['type'] == 'none':
+        return rgb
+    if color_transform['type'] == 'srgb':
+        return linear_to_srgb(rgb)
+    return apply_cube_lut(rgb, color_transform['lut'], color_transform['interpolation'])
+
+def set_worker_color_transform(color_transform):
+    """Process-pool initializer: hand the job's (possibly large) LUT to each worker once."""
+    global worker_color_transform
+    worker_color_transform = color_transform
+
+def get_exr_frame_size(exr_path):
+    """Return (width, height) of an EXR frame's data window."""
     exr_file = OpenEXR.InputFile(exr_path)
+    data_window = exr_file.header()['dataWindow']
+    exr_file.close()
+    return (
+        data_window.max.x - data_window.min.x + 1,
+        data_window.max.y - data_window.min.y + 1,
+    )
+
+def decode_exr_frame_rgb8(exr_path, aov_spec, color_transform, out=None, exr_data=None):
+    """Decode one EXR AOV to 8-bit RGB, optionally into a preallocated (height, width, 3) array.
+
+    When `exr_data` holds the prefetched file bytes, they are decoded instead of opening `exr_path`.
+    """
+    exr_file = OpenEXR.InputFile(io.BytesIO(exr_data) if exr_data is not None else exr_path)
     header = exr_file.header()
     data_window = header['dataWindow']
     width = data_window.max.x - data_window.min.x + 1
     height = data_window.max.y - data_window.min.y + 1
+    if out is not None and out.shape[:2] != (height, width):
+        exr_file.close()
+        raise ValueError(
+            f"EXR frame is {width}x{height}, expected {out.shape[1]}x{out.shape[0]}: {exr_path}"
+        )
 
     channels = aov_spec['channels']
     if all(c in channels for c in ('R', 'G', 'B')):
@@ -215,22 +591,276 @@ def convert_exr_frame_to_png(exr_path, png_path, aov_spec, aov_name):
         alpha = np.clip(alpha, 0.0, 1.0)[..., np.newaxis]
         rgb = rgb * alpha
 
-    # Beauty is usually stored in linear space, so convert to display-referred sRGB.
-    if str(aov_name).lower() == 'beauty':
-        rgb = linear_to_srgb(rgb)
+    rgb = apply_color_transform(rgb, color_transform)
 
     rgb = np.clip(rgb, 0.0, 1.0)
-    rgb_u8 = (rgb * 255.0).astype(np.uint8)
+    rgb *= 255.0
+    if out is None:
+        return rgb.astype(np.uint8)
+    out[...] = rgb
+    return out
+
+def convert_exr_frame_to_png(exr_path, png_path, aov_spec, color_transform):
+    rgb_u8 = decode_exr_frame_rgb8(exr_path, aov_spec, color_transform)
     Image.fromarray(rgb_u8, mode='RGB').save(png_path)
 
+class SharedFrameRing:
+    """Fixed pool of shared-memory frame slots that EXR workers decode into.
+
+    Only slot names/indices cross the process boundary; the pixels stay in
+    shared memory until the consumer has written them and released the slot.
+    """
+
+    def __init__(self, slot_count, frame_shape, dtype=np.uint8):
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.frame_bytes = int(np.prod(self.frame_shape)) * self.dtype.itemsize
+        self.slots = []
+        self.free_slots = deque()
+        try:
+            for slot_index in range(slot_count):
+                self.slots.append(shared_memory.SharedMemory(create=True, size=self.frame_bytes))
+                self.free_slots.append(slot_index)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def has_free_slot(self):
+        return bool(self.free_slots)
+
+    def acquire(self):
+        return self.free_slots.popleft()
+
+    def release(self, slot_index):
+        self.free_slots.append(slot_index)
+
+    def slot_name(self, slot_index):
+        return self.slots[slot_index].name
+
+    def write_slot(self, slot_index, stream):
+        """Write a slot's frame bytes to a binary stream without copying."""
+        with self.slots[slot_index].buf[:self.frame_bytes] as frame_bytes:
+            stream.write(frame_bytes)
+
+    def close(self):
+        for slot in self.slots:
+            try:
+                slot.close()
+                slot.unlink()
+            except FileNotFoundError:
+                pass
+        self.slots = []
+        self.free_slots.clear()
+
 def preprocess_exr_frame_task(task):
     """Process-pool worker for EXR -> PNG conversion."""
-    exr_path, png_path, aov_spec, aov_name, frame_number = task
+    exr_path, png_path, aov_spec, frame_number = task
     if not os.path.exists(exr_path):
         raise FileNotFoundError(f"Missing EXR frame: {exr_path}")
-    convert_exr_frame_to_png(exr_path, png_path, aov_spec, aov_name)
+    convert_exr_frame_to_png(exr_path, png_path, aov_spec, worker_color_transform)
     return frame_number
 
+def decode_exr_frame_to_slot_task(task):
+    """Process-pool worker that decodes an EXR frame into a shared-memory slot."""
+    exr_path, exr_buffer_name, exr_size, slot_name, frame_shape, aov_spec, slot_index = task
+    exr_data = None
+    if exr_buffer_name is not None:
+        # Prefetched file: one local copy out of shared memory instead of pickling it through the pool.
+        exr_buffer = shared_memory.SharedMemory(name=exr_buffer_name)
+        try:
+            with exr_buffer.buf[:exr_size] as view:
+                exr_data = bytes(view)
+        finally:
+            exr_buffer.close()
+    elif not os.path.exists(exr_path):
+        raise FileNotFoundError(f"Missing EXR frame: {exr_path}")
+    slot = shared_memory.SharedMemory(name=slot_name)
+    try:
+        frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=slot.buf)
+        try:
+            decode_exr_frame_rgb8(exr_path, aov_spec, worker_color_transform, out=frame, exr_data=exr_data)
+        except Exception as e:
+            if exr_data is None:
+                raise
+            # In-memory decode errors only name '<Python Stream>'; point at the file instead.
+            raise RuntimeError(f"{exr_path}: {e}") from e
+        finally:
+            del frame
+    finally:
+        slot.close()
+    return slot_index
+
+def feed_exr_frames_from_shared_memory(stream, source_frames, aov_spec, color_transform, frame_shape, prefetch=False,
+                                       decode_task=None):
+    """Decode EXR frames in parallel into a slot ring and write them to stream in frame order.
+
+    With `prefetch`, file bytes are read ahead into shared-memory buffers by a
+    FramePrefetcher; workers get only the buffer name and length, and new
+    decodes wait while the held buffers would exceed its byte budget.
+    `decode_task` replaces decode_exr_frame_to_slot_task (used by the benchmark
+    and check_frame_prefetch.py).
+    """
+    decode_task = decode_task or decode_exr_frame_to_slot_task
+    worker_count = min(EXR_PREPROCESS_WORKERS, len(source_frames))
+    slot_count = max(worker_count, EXR_SHARED_MEMORY_SLOTS)
+    in_flight = deque()
+    next_index = 0
+    prefetcher = None
+    prefetched = None
+    mp_context = None
+    if prefetch:
+        prefetcher = FramePrefetcher([path for _, path in source_frames], shared_memory_buffers=True)
+        prefetched = iter(prefetcher)
+        # Workers start on the first submit, after the prefetch threads; forking then can copy a lock
+        # held by a prefetch thread (e.g. the shared-memory resource tracker's) and hang the worker.
+        mp_context = multiprocessing.get_context('spawn')
+
+    with SharedFrameRing(slot_count, frame_shape) as ring:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=worker_count,
+                mp_context=mp_context,
+                initializer=set_worker_color_transform,
+                initargs=(color_transform,)
+            ) as executor:
+                try:
+                    while next_index < len(source_frames) or in_flight:
+                        if current_process['should_stop']:
+                            return
+
+                        # Keep every free slot busy; completed frames wait in their slot until their turn.
+                        # With prefetch, held file buffers must also fit the read-ahead byte budget.
+                        while (
+                            next_index < len(source_frames)
+                            and ring.has_free_slot()
+                            and (not prefetcher or not in_flight or prefetcher.has_budget_for_next_frame())
+                        ):
+                            frame_number, exr_path = source_frames[next_index]
+                            exr_frame = None
+                            if prefetched:
+                                try:
+                                    exr_frame = next(prefetched)
+                                except Exception as e:
+                                    raise RuntimeError(
+                                        f"Failed reading EXR frame {frame_number} ({exr_path}): {e}"
+                                    ) from e
+                            slot_index = ring.acquire()
+                            task = (
+                                exr_path,
+                                exr_frame.buffer.name if exr_frame else None,
+                                exr_frame.size if exr_frame else 0,
+                                ring.slot_name(slot_index), ring.frame_shape, aov_spec, slot_index
+                            )
+                            future = executor.submit(decode_task, task)
+                            in_flight.append((frame_number, future, exr_frame))
+                            next_index += 1
+
+                        frame_number, future, exr_frame = in_flight.popleft()
+                        try:
+                            slot_index = future.result()
+                        except Exception as e:
+                            raise RuntimeError(f"Failed EXR decoding at frame {frame_number}: {e}") from e
+                        finally:
+                            if exr_frame:
+                                prefetcher.release(exr_frame)
+                        ring.write_slot(slot_index, stream)
+                        ring.release(slot_index)
+                finally:
+                    for _, pending_future, _ in in_flight:
+                        pending_future.cancel()
+        finally:
+            # Workers are done with the prefetched buffers once the pool has shut down.
+            for _, _, exr_frame in in_flight:
+                if exr_frame:
+                    prefetcher.release(exr_frame)
+            if prefetched:
+                prefetched.close()
+
+def convert_exr_aov_to_video_via_shared_memory(sequence_info, aov_spec, color_transform, output_name, framerate):
+    """Encode one EXR AOV by streaming shared-memory decoded frames into ffmpeg as raw RGB."""
+    try:
+        width, height = get_exr_frame_size(get_first_frame_path(sequence_info))
+    except Exception as e:
+        return False, f"Failed to read EXR frame size: {e}"
+    loop_count = sequence_info.get('loop_count', 1)
+    prefetch = bool(sequence_info.get('prefetch_frames'))
+    source_frames = list(zip(
+        range(sequence_info['start_frame'], sequence_info['start_frame'] + sequence_info['count']),
+        get_sequence_frame_paths(sequence_info)
+    ))
+    total_frames = len(source_frames)
+    output_path = os.path.join(sequence_info['folder'], output_name)
+    # Piped input cannot use -stream_loop, so the frames are decoded and encoded
+    # once and the encoded clip is looped afterwards.
+    encode_path = output_path
+    if loop_count > 1:
+        encode_path = os.path.join(
+            sequence_info['folder'],
+            f".tmp_{uuid.uuid4().hex[:8]}_{output_name}"
+        )
+    conversion_progress['total_frames'] = total_frames
+
+    add_log_message(
+        f"Streaming {total_frames} EXR frames ({width}x{height}, {loop_count} repetition(s)) "
+        f"to ffmpeg with {min(EXR_PREPROCESS_WORKERS, total_frames)} parallel worker(s)"
+    )
+    if prefetch:
+        log_prefetch_settings()
+    add_log_message(f"Output path: {output_path}")
+
+    cmd = [
+        'ffmpeg',
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        '-s', f"{width}x{height}",
+        '-framerate', str(framerate),
+        '-i', 'pipe:0',
+    ]
+    cmd.extend(build_encode_args(
+        sequence_info,
+        total_frames,
+        framerate,
+        get_even_padding_filter(width, height),
+        encode_path
+    ))
+    try:
+        success, result = run_ffmpeg_encode(
+            cmd,
+            encode_path,
+            frame_feeder=lambda stream: feed_exr_frames_from_shared_memory(
+                stream, source_frames, aov_spec, color_transform, (height, width, 3), prefetch=prefetch
+            )
+        )
+        if not success or loop_count == 1:
+            return success, result
+        return loop_encoded_video(encode_path, output_path, loop_count, total_frames)
+    finally:
+        if encode_path != output_path and os.path.exists(encode_path):
+            os.remove(encode_path)
+
+def loop_encoded_video(input_path, output_path, loop_count, frame_count):
+    """Repeat an encoded clip loop_count times by stream copy (no re-decode or re-encode)."""
+    add_log_message(f"Looping encoded clip {loop_count} time(s) into {output_path}")
+    conversion_progress['total_frames'] = frame_count * loop_count
+    conversion_progress['progress'] = 0
+    cmd = [
+        'ffmpeg',
+        '-stream_loop', str(loop_count - 1),
+        '-i', input_path,
+        '-c', 'copy',
+        '-progress', 'pipe:1',
+        '-stats',
+        '-y',
+        output_path
+    ]
+    return run_ffmpeg_encode(cmd, output_path)
+
 def convert_exr_sequence_to_videos(sequence_info, framerate):
     ok, error = ensure_exr_dependencies()
     if not ok:
@@ -249,7 +879,10 @@ def convert_exr_sequence_to_videos(sequence_info, framerate):
     base_name = sequence_info['base_name'].strip('_')
     pad_len = parse_pattern_padding(sequence_info['pattern'])
     delete_temp_files = bool(sequence_info.get('delete_temp_files', True))
+    if EXR_FRAME_TRANSPORT == 'png' and sequence_info.get('prefetch_frames'):
+        add_log_message("Read-ahead is not supported by the PNG EXR transport; reading frames directly")
     total_aovs = len(selected_aovs)
+    aov_color_transforms = sequence_info.get('aov_color_transforms') or {}
     frame_numbers = range(
         sequence_info['start_frame'],
         sequence_info['start_frame'] + sequence_info['count']
@@ -259,11 +892,31 @@ def convert_exr_sequence_to_videos(sequence_info, framerate):
         if current_process['should_stop']:
             return False, "Conversion stopped by user"
 
-        conversion_progress['current_stage'] = f"Preprocessing EXR to PNG ({aov_name}, {aov_index}/{total_aovs})"
         conversion_progress['progress'] = 0
         add_log_message(f"Preparing EXR AOV '{aov_name}' for {sequence_info['base_name']}")
         safe_base = sanitize_name(base_name or sequence_info['base_name'])
         safe_aov = sanitize_name(aov_name)
+        output_name = f"{safe_base}_{safe_aov}.mp4"
+        try:
+            color_transform = resolve_color_transform(aov_color_transforms.get(aov_name), aov_name)
+        except Exception as e:
+            return False, f"Failed to load color transform for AOV '{aov_name}': {e}"
+        add_log_message(f"Color transform for '{aov_name}': {color_transform['label']}")
+
+        if EXR_FRAME_TRANSPORT == 'shared_memory':
+            conversion_progress['current_stage'] = f"Decoding EXR and creating MP4 ({aov_name}, {aov_index}/{total_aovs})"
+            success, result = convert_exr_aov_to_video_via_shared_memory(
+                sequence_info,
+                aov_map[aov_name],
+                color_transform,
+                output_name=output_name,
+                framerate=framerate
+            )
+            if not success:
+                return False, result
+            continue
+
+        conversion_progress['current_stage'] = f"Preprocessing EXR to PNG ({aov_name}, {aov_index}/{total_aovs})"
         temp_dir_name = f".tmp_{safe_base}_{safe_aov}_{uuid.uuid4().hex[:8]}"
         temp_dir = os.path.join(sequence_info['folder'], temp_dir_name)
         os.makedirs(temp_dir, exist_ok=True)
@@ -277,7 +930,7 @@ def convert_exr_sequence_to_videos(sequence_info, framerate):
                     sequence_info['pattern'] % frame_number
                 )
                 png_frame = os.path.join(temp_dir, temp_pattern % frame_number)
-                tasks.append((source_frame, png_frame, aov_map[aov_name], aov_name, frame_number))
+                tasks.append((source_frame, png_frame, aov_map[aov_name], frame_number))
 
             total_tasks = len(tasks)
             if total_tasks == 0:
@@ -289,9 +942,13 @@ def convert_exr_sequence_to_videos(sequence_info, framerate):
             )
 
             completed_tasks = 0
-            with ProcessPoolExecutor(max_workers=worker_count) as executor:
+            with ProcessPoolExecutor(
+                max_workers=worker_count,
+                initializer=set_worker_color_transform,
+                initargs=(color_transform,)
+            ) as executor:
                 future_to_frame = {
-                    executor.submit(preprocess_exr_frame_task, task): task[4]
+                    executor.submit(preprocess_exr_frame_task, task): task[3]
                     for task in tasks
                 }
                 for future in as_completed(future_to_frame):
@@ -322,7 +979,6 @@ def convert_exr_sequence_to_videos(sequence_info, framerate):
                 'encode_quality': sequence_info.get('encode_quality', 'balanced'),
                 'output_folder': sequence_info['folder'],
             }
-            output_name = f"{safe_base}_{safe_aov}.mp4"
             conversion_progress['current_stage'] = f"Creating MP4 ({aov_name}, {aov_index}/{total_aovs})"
             conversion_progress['progress'] = 0
             success, result = convert_to_video(
@@ -385,6 +1041,7 @@ def find_image_sequences(folder_path):
                     'extension': extension,
                     'source_type': 'exr' if extension == 'exr' else 'image',
                     'selected_aovs': [],
+                    'aov_color_transforms': {},
                 }
                 add_log_message(
                     f"Found {extension.upper()} sequence: {base_name} with {len(files)} "
@@ -393,115 +1050,38 @@ def find_image_sequences(folder_path):
     
     return sequences
 
-def convert_to_video(sequence_info, output_name=None, framerate=24):
-    """Convert image sequence to MP4 using ffmpeg"""
-    global conversion_progress, current_process
-    
-    if current_process['should_stop']:
-        return False, "Conversion stopped by user"
-    
-    if output_name is None:
-        output_name = sequence_info['base_name'].strip('_') + '.mp4'
-    
-    output_folder = sequence_info.get('output_folder', sequence_info['folder'])
-    output_path = os.path.join(output_folder, output_name)
-    input_pattern = os.path.join(sequence_info['folder'], sequence_info['pattern'])
-    
-    # Store total frames for progress calculation, accounting for loop count
-    loop_count = sequence_info.get('loop_count', 1)
-    conversion_progress['total_frames'] = sequence_info['count'] * loop_count
-    
-    add_log_message(f"Starting conversion of {sequence_info['base_name']} with {loop_count} repetition(s)")
-    add_log_message(f"Input pattern: {input_pattern}")
-    add_log_message(f"Output path: {output_path}")
-    add_log_message(f"Start frame: {sequence_info['start_frame']}, Total frames: {sequence_info['count'] * loop_count}")
+def get_even_padding_filter(width, height):
+    """Return an ffmpeg pad filter that makes odd dimensions even, or None."""
+    # Many encoders require even dimensions (e.g., yuv420p / H.264).
+    pad_width = width + (width % 2)
+    pad_height = height + (height % 2)
 
+    if pad_width != width or pad_height != height:
+        add_log_message(f"Adding padding to make dimensions even: {pad_width}x{pad_height}")
+        return f"pad={pad_width}:{pad_height}:(ow-iw)/2:(oh-ih)/2:color=black"
+    return None
+
+def build_encode_args(sequence_info, total_frames, framerate, filter_complex, output_path):
+    """Return the ffmpeg arguments that follow the video input: silent audio, filters, codecs, output."""
     quality_key = sequence_info.get('encode_quality') or 'balanced'
     crf, x264_preset = ENCODE_QUALITY_PRESETS.get(
         quality_key, ENCODE_QUALITY_PRESETS['balanced']
     )
     add_log_message(f"Encode quality: {quality_key} (CRF {crf}, preset {x264_preset})")
-    
-    # First, get the resolution of the first image
-    filter_complex = None
-    first_frame_path = os.path.join(
-        sequence_info['folder'],
-        sequence_info['pattern'] % sequence_info['start_frame']
-    )
-    probe_cmd = [
-        'ffprobe',
-        '-v', 'error',
-        '-select_streams', 'v:0',
-        '-show_entries', 'stream=width,height',
-        '-of', 'json',
-        first_frame_path,
-    ]
-    
-    try:
-        probe_process = subprocess.Popen(
-            probe_cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            universal_newlines=True
-        )
-        probe_stdout, probe_stderr = probe_process.communicate()
-
-        if probe_process.returncode != 0:
-            add_log_message(f"ffprobe failed ({probe_process.returncode}): {probe_stderr.strip()}")
-        else:
-            try:
-                probe_json = json.loads(probe_stdout or "{}")
-                streams = probe_json.get("streams") or []
-                if streams and isinstance(streams[0], dict):
-                    width = int(streams[0].get("width") or 0)
-                    height = int(streams[0].get("height") or 0)
-                else:
-                    width = height = 0
-
-                if width > 0 and height > 0:
-                    add_log_message(f"Detected resolution: {width}x{height}")
 
-                    # Many encoders require even dimensions (e.g., yuv420p / H.264).
-                    pad_width = width + (width % 2)
-                    pad_height = height + (height % 2)
-
-                    if pad_width != width or pad_height != height:
-                        add_log_message(f"Adding padding to make dimensions even: {pad_width}x{pad_height}")
-                        filter_complex = f"pad={pad_width}:{pad_height}:(ow-iw)/2:(oh-ih)/2:color=black"
-                else:
-                    add_log_message("Could not detect resolution; skipping padding filter.")
-            except Exception as e:
-                add_log_message(f"Error parsing ffprobe output; skipping padding filter: {e}")
-    except Exception as e:
-        add_log_message(f"Error detecting resolution: {e}")
-        return False, str(e)
-    
-    cmd = [
-        'ffmpeg', '-framerate', str(framerate),
-        '-start_number', str(sequence_info['start_frame']),
-    ]
-
-    # Add stream loop if specified
-    loop_count = sequence_info.get('loop_count', 1)
-    if loop_count > 1:
-        cmd.extend(['-stream_loop', str(loop_count - 1)])
-
-    cmd.extend(['-i', input_pattern])
-    
     # Calculate total duration in seconds
-    total_frames = sequence_info['count'] * loop_count
     duration_seconds = total_frames / framerate
-    
+
     # Generate silent audio track with aevalsrc instead of anullsrc
-    cmd.extend([
+    args = [
         '-f', 'lavfi', 
         '-i', f'aevalsrc=0:d={duration_seconds}:s=48000',
-    ])
+    ]
     
     if filter_complex:
-        cmd.extend(['-vf', filter_complex])
+        args.extend(['-vf', filter_complex])
     
-    cmd.extend([
+    args.extend([
         '-c:v', 'libx264',
         '-crf', crf,
         '-preset', x264_preset,
@@ -512,12 +1092,18 @@ def convert_to_video(sequence_info, output_name=None, framerate=24):
         '-y',
         output_path
     ])
-    
+    return args
+
+def run_ffmpeg_encode(cmd, output_path, frame_feeder=None):
+    """Run an ffmpeg command, tracking progress; frame_feeder(stream) writes raw frames to stdin."""
     add_log_message(f"Running command: {' '.join(cmd)}")
     
+    feeder_thread = None
+    feeder_errors = []
     try:
         process = subprocess.Popen(
             cmd,
+            stdin=subprocess.PIPE if frame_feeder else None,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             universal_newlines=True,
@@ -534,6 +1120,26 @@ def convert_to_video(sequence_info, output_name=None, framerate=24):
         stderr_thread = threading.Thread(target=read_stderr)
         stderr_thread.daemon = True
         stderr_thread.start()
+
+        if frame_feeder:
+            def feed_stdin():
+                try:
+                    frame_feeder(process.stdin.buffer)
+                except BrokenPipeError:
+                    # ffmpeg exited early; its return code reports why.
+                    pass
+                except Exception as e:
+                    feeder_errors.append(e)
+                    process.terminate()
+                finally:
+                    try:
+                        process.stdin.close()
+                    except OSError:
+                        pass
+
+            feeder_thread = threading.Thread(target=feed_stdin)
+            feeder_thread.daemon = True
+            feeder_thread.start()
         
         while True:
             if current_process['should_stop']:
@@ -553,8 +1159,13 @@ def convert_to_video(sequence_info, output_name=None, framerate=24):
         
         process.wait()
         return_code = process.poll()
+        if feeder_thread:
+            feeder_thread.join()
         
-        if return_code == 0:
+        if feeder_errors:
+            add_log_message(f"Frame feeding error: {feeder_errors[0]}")
+            return False, str(feeder_errors[0])
+        elif return_code == 0:
             conversion_progress['progress'] = 100
             add_log_message(f"Conversion completed successfully: {output_path}")
             return True, output_path
@@ -567,8 +1178,116 @@ def convert_to_video(sequence_info, output_name=None, framerate=24):
         add_log_message(f"Exception during conversion: {str(e)}")
         return False, str(e)
     finally:
+        if feeder_thread:
+            # Let the feeder release its worker pool and shared memory before returning.
+            feeder_thread.join()
         current_process['process'] = None
 
+def convert_to_video(sequence_info, output_name=None, framerate=24):
+    """Convert image sequence to MP4 using ffmpeg"""
+    global conversion_progress, current_process
+    
+    if current_process['should_stop']:
+        return False, "Conversion stopped by user"
+    
+    if output_name is None:
+        output_name = sequence_info['base_name'].strip('_') + '.mp4'
+    
+    output_folder = sequence_info.get('output_folder', sequence_info['folder'])
+    output_path = os.path.join(output_folder, output_name)
+    input_pattern = os.path.join(sequence_info['folder'], sequence_info['pattern'])
+    
+    # Store total frames for progress calculation, accounting for loop count
+    loop_count = sequence_info.get('loop_count', 1)
+    conversion_progress['total_frames'] = sequence_info['count'] * loop_count
+    
+    add_log_message(f"Starting conversion of {sequence_info['base_name']} with {loop_count} repetition(s)")
+    add_log_message(f"Input pattern: {input_pattern}")
+    add_log_message(f"Output path: {output_path}")
+    add_log_message(f"Start frame: {sequence_info['start_frame']}, Total frames: {sequence_info['count'] * loop_count}")
+    
+    # First, get the resolution of the first image
+    filter_complex = None
+    first_frame_path = os.path.join(
+        sequence_info['folder'],
+        sequence_info['pattern'] % sequence_info['start_frame']
+    )
+    probe_cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height',
+        '-of', 'json',
+        first_frame_path,
+    ]
+    
+    try:
+        probe_process = subprocess.Popen(
+            probe_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True
+        )
+        probe_stdout, probe_stderr = probe_process.communicate()
+
+        if probe_process.returncode != 0:
+            add_log_message(f"ffprobe failed ({probe_process.returncode}): {probe_stderr.strip()}")
+        else:
+            try:
+                probe_json = json.loads(probe_stdout or "{}")
+                streams = probe_json.get("streams") or []
+                if streams and isinstance(streams[0], dict):
+                    width = int(streams[0].get("width") or 0)
+                    height = int(streams[0].get("height") or 0)
+                else:
+                    width = height = 0
+
+                if width > 0 and height > 0:
+                    add_log_message(f"Detected resolution: {width}x{height}")
+                    filter_complex = get_even_padding_filter(width, height)
+                else:
+                    add_log_message("Could not detect resolution; skipping padding filter.")
+            except Exception as e:
+                add_log_message(f"Error parsing ffprobe output; skipping padding filter: {e}")
+    except Exception as e:
+        add_log_message(f"Error detecting resolution: {e}")
+        return False, str(e)
+    
+    frame_feeder = None
+    extension = os.path.splitext(sequence_info['pattern'])[1].lstrip('.').lower()
+    if sequence_info.get('prefetch_frames') and extension in IMAGE_PIPE_CODECS:
+        # Piped input cannot use -stream_loop, so loops are read again.
+        frame_paths = get_sequence_frame_paths(sequence_info) * loop_count
+        log_prefetch_settings()
+        cmd = [
+            'ffmpeg',
+            '-f', 'image2pipe',
+            '-c:v', IMAGE_PIPE_CODECS[extension],
+            '-framerate', str(framerate),
+            '-i', 'pipe:0',
+        ]
+        frame_feeder = lambda stream: feed_prefetched_frames(stream, frame_paths)
+    else:
+        cmd = [
+            'ffmpeg', '-framerate', str(framerate),
+            '-start_number', str(sequence_info['start_frame']),
+        ]
+
+        # Add stream loop if specified
+        if loop_count > 1:
+            cmd.extend(['-stream_loop', str(loop_count - 1)])
+
+        cmd.extend(['-i', input_pattern])
+
+    cmd.extend(build_encode_args(
+        sequence_info,
+        sequence_info['count'] * loop_count,
+        framerate,
+        filter_complex,
+        output_path
+    ))
+    return run_ffmpeg_encode(cmd, output_path, frame_feeder=frame_feeder)
+
 def convert_sequences(sequences_to_convert):
     """Convert multiple sequences and track progress"""
     global conversion_progress, current_process
@@ -620,7 +1339,7 @@ def convert_sequences(sequences_to_convert):
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', exr_uses_temp_pngs=EXR_FRAME_TRANSPORT == 'png')
 
 @app.route('/scan', methods=['POST'])
 def scan_folder():
@@ -646,11 +1365,21 @@ def convert_sequence():
         q = sequence.get('encode_quality')
         if q not in ENCODE_QUALITY_PRESETS:
             sequence['encode_quality'] = 'balanced'
+        sequence['prefetch_frames'] = bool(sequence.get('prefetch_frames', False))
         if is_exr_sequence(sequence):
             selected_aovs = sequence.get('selected_aovs') or []
             if not isinstance(selected_aovs, list):
                 sequence['selected_aovs'] = []
             sequence['delete_temp_files'] = bool(sequence.get('delete_temp_files', True))
+            aov_color_transforms = sequence.get('aov_color_transforms')
+            if not isinstance(aov_color_transforms, dict):
+                aov_color_transforms = {}
+            valid_transforms = set(BUILTIN_COLOR_TRANSFORMS) | set(list_cube_luts())
+            sequence['aov_color_transforms'] = {
+                str(aov): choice
+                for aov, choice in aov_color_transforms.items()
+                if isinstance(choice, str) and choice in valid_transforms
+            }
 
     # Start conversion in a separate thread
     thread = threading.Thread(target=convert_sequences, args=(sequences_info,))
@@ -674,7 +1403,9 @@ def exr_aovs():
     return jsonify({
         'success': True,
         'aovs': aov_names,
-        'selected_aovs': sequence_info.get('selected_aovs') or aov_names
+        'selected_aovs': sequence_info.get('selected_aovs') or aov_names,
+        'color_transforms': list(BUILTIN_COLOR_TRANSFORMS) + list_cube_luts(),
+        'aov_color_transforms': sequence_info.get('aov_color_transforms') or {}
     })
 
 @app.route('/stop', methods=['POST'])
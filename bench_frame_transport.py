@@ -0,0 +1,163 @@
+"""Benchmark EXR worker -> encoder frame transports.
+
+Compares the three ways a process-pool worker can hand an 8-bit RGB frame
+back to the encoder feeder:
+
+- pickle:        the worker returns the NumPy array through the pool's pipe
+- png:           the worker writes a PNG, the feeder reads it back
+- shared_memory: app.feed_exr_frames_from_shared_memory, the shipped EXR
+                 feeder, with a synthetic decode task in place of OpenEXR
+
+Frames are synthesized in the worker (a gradient plus seeded noise, so PNG
+compression costs what it would on rendered frames) and the numbers reflect
+transport cost, not EXR decoding. Every path writes the final bytes to
+os.devnull, as the feeder writes them to ffmpeg's stdin.
+
+Usage:
+    python bench_frame_transport.py [--width 3840] [--height 2160] [--frames 48] [--workers 4]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+import app
+
+# Textured base frame per worker process, keyed by frame shape
+base_frames = {}
+
+
+def textured_base_frame(frame_shape):
+    """Return a float32 gradient plus seeded noise, built once per worker."""
+    if frame_shape not in base_frames:
+        height, width, _ = frame_shape
+        gradient = np.linspace(0.0, 0.8, width, dtype=np.float32)[np.newaxis, :, np.newaxis]
+        rgb = np.broadcast_to(gradient, frame_shape).copy()
+        rgb[..., 1] *= np.linspace(0.5, 1.0, height, dtype=np.float32)[:, np.newaxis]
+        rgb += np.random.default_rng(0).random(frame_shape, dtype=np.float32) * 0.2
+        base_frames[frame_shape] = rgb
+    return base_frames[frame_shape]
+
+
+def synthesize_frame(frame_number, frame_shape, out=None):
+    """Stand-in for decode_exr_frame_rgb8: produce a float frame and quantize it to uint8."""
+    rgb = textured_base_frame(frame_shape) * (1.0 - (frame_number % 8) * 0.01)
+    rgb *= 255.0
+    if out is None:
+        return rgb.astype(np.uint8)
+    out[...] = rgb
+    return out
+
+
+def pickle_task(task):
+    frame_number, frame_shape = task
+    return synthesize_frame(frame_number, frame_shape)
+
+
+def png_task(task):
+    frame_number, frame_shape, png_path = task
+    Image.fromarray(synthesize_frame(frame_number, frame_shape), mode='RGB').save(png_path)
+    return png_path
+
+
+def shared_memory_task(task):
+    """Same task tuple as app.decode_exr_frame_to_slot_task; the path carries the frame number."""
+    exr_path, _, _, slot_name, frame_shape, _, slot_index = task
+    slot = shared_memory.SharedMemory(name=slot_name)
+    try:
+        frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=slot.buf)
+        synthesize_frame(int(exr_path), frame_shape, out=frame)
+        del frame
+    finally:
+        slot.close()
+    return slot_index
+
+
+def run_ordered(executor, submit_frame, frame_count, window, consume):
+    """Submit up to `window` frames ahead and consume results in frame order."""
+    in_flight = deque()
+    next_frame = 0
+    while next_frame < frame_count or in_flight:
+        while next_frame < frame_count and len(in_flight) < window:
+            in_flight.append(submit_frame(next_frame))
+            next_frame += 1
+        consume(in_flight.popleft().result())
+
+
+def bench_pickle(sink, frame_shape, frame_count, workers):
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        run_ordered(
+            executor,
+            lambda n: executor.submit(pickle_task, (n, frame_shape)),
+            frame_count,
+            workers * 2,
+            lambda frame: sink.write(memoryview(frame))
+        )
+
+
+def bench_png(sink, frame_shape, frame_count, workers):
+    temp_dir = tempfile.mkdtemp(prefix='bench_frames_')
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            run_ordered(
+                executor,
+                lambda n: executor.submit(
+                    png_task, (n, frame_shape, os.path.join(temp_dir, f"frame_{n:05d}.png"))
+                ),
+                frame_count,
+                workers * 2,
+                lambda png_path: sink.write(memoryview(np.asarray(Image.open(png_path).convert('RGB'))))
+            )
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def bench_shared_memory(sink, frame_shape, frame_count, workers):
+    # Match the worker count and slot ring used by the other transports.
+    app.EXR_PREPROCESS_WORKERS = workers
+    app.EXR_SHARED_MEMORY_SLOTS = workers * 2
+    source_frames = [(frame_number, str(frame_number)) for frame_number in range(frame_count)]
+    app.feed_exr_frames_from_shared_memory(
+        sink, source_frames, {}, None, frame_shape, decode_task=shared_memory_task
+    )
+
+
+BENCHMARKS = (
+    ('pickle', bench_pickle),
+    ('png', bench_png),
+    ('shared_memory', bench_shared_memory),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--width', type=int, default=3840)
+    parser.add_argument('--height', type=int, default=2160)
+    parser.add_argument('--frames', type=int, default=48)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    frame_shape = (args.height, args.width, 3)
+    frame_mb = args.width * args.height * 3 / (1024 * 1024)
+    print(f"{args.frames} frames of {args.width}x{args.height} RGB ({frame_mb:.1f} MB each), {args.workers} workers")
+
+    with open(os.devnull, 'wb') as sink:
+        for name, bench in BENCHMARKS:
+            start = time.perf_counter()
+            bench(sink, frame_shape, args.frames, args.workers)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>14}: {elapsed:7.2f} s  {args.frames / elapsed:7.1f} fps  "
+                f"{args.frames * frame_mb / elapsed:8.1f} MB/s"
+            )
+
+
+if __name__ == '__main__':
+    main()
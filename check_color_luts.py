@@ -0,0 +1,122 @@
+"""Sanity checks for the .cube LUT parser and interpolation kernels in app.py.
+
+Covers the easy-to-break parts: red-fastest 3D row order, the 1D shaper rows
+preceding the 3D rows, exact lattice points and tetrahedral tie-breaking for
+both interpolation modes, and float32 arithmetic throughout.
+
+Usage:
+    python check_color_luts.py
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from app import apply_cube_lut, compile_lut_domain, load_cube_lut, lut_coordinates
+
+INTERPOLATIONS = ('trilinear', 'tetrahedral')
+
+
+def write_cube(folder, name, header_lines, rows):
+    path = os.path.join(folder, name)
+    with open(path, 'w') as f:
+        f.write('\n'.join(header_lines) + '\n')
+        for row in rows:
+            f.write('%.9f %.9f %.9f\n' % tuple(row))
+    return path
+
+
+def lattice_rgb(size):
+    """Lattice inputs in file row order: red changes fastest, then green, then blue."""
+    grid = np.linspace(0.0, 1.0, size, dtype=np.float32)
+    blue, green, red = np.meshgrid(grid, grid, grid, indexing='ij')
+    return np.stack([red, green, blue], axis=-1).reshape(-1, 3)
+
+
+def check_identity_3d(folder):
+    size = 17
+    path = write_cube(folder, 'identity.cube', ['TITLE "identity"', f'LUT_3D_SIZE {size}'], lattice_rgb(size))
+    lut = load_cube_lut(path)
+    rgb = np.random.default_rng(0).random((37, 53, 3), dtype=np.float32)
+    for interpolation in INTERPOLATIONS:
+        out = apply_cube_lut(rgb, lut, interpolation)
+        assert out.dtype == np.float32, (interpolation, out.dtype)
+        assert np.allclose(out, rgb, atol=1e-6), (interpolation, np.abs(out - rgb).max())
+
+
+def check_lattice_points_exact(folder):
+    # A random, asymmetric table catches any mix-up of the red/blue axes.
+    size = 9
+    table = np.random.default_rng(1).random((size ** 3, 3), dtype=np.float32)
+    path = write_cube(folder, 'random.cube', [f'LUT_3D_SIZE {size}'], table)
+    lut = load_cube_lut(path)
+    rgb = lattice_rgb(size).reshape(size * size, size, 3)
+    for interpolation in INTERPOLATIONS:
+        out = apply_cube_lut(rgb, lut, interpolation).reshape(-1, 3)
+        assert np.allclose(out, table, atol=1e-6), (interpolation, np.abs(out - table).max())
+
+
+def check_affine_and_ties(folder):
+    # Both kernels reproduce an affine LUT exactly, whichever tetrahedron a
+    # pixel falls in, including ties between fractional offsets.
+    size = 5
+    matrix = np.array([[0.7, 0.2, 0.1], [0.05, 0.9, 0.05], [0.3, 0.0, 0.6]], dtype=np.float32)
+    lattice = lattice_rgb(size)
+    path = write_cube(folder, 'affine.cube', [f'LUT_3D_SIZE {size}'], lattice @ matrix.T + 0.01)
+    lut = load_cube_lut(path)
+    step = 1.0 / (size - 1)
+    rgb = np.array([
+        [0.3, 0.2, 0.1], [0.3, 0.1, 0.2], [0.2, 0.3, 0.1],
+        [0.1, 0.3, 0.2], [0.2, 0.1, 0.3], [0.1, 0.2, 0.3],
+        [0.1, 0.1, 0.2], [0.2, 0.1, 0.1], [0.1, 0.2, 0.2], [0.15, 0.15, 0.15],
+    ], dtype=np.float32) * step + step
+    expected = rgb @ matrix.T + 0.01
+    for interpolation in INTERPOLATIONS:
+        out = apply_cube_lut(rgb.reshape(1, -1, 3), lut, interpolation).reshape(-1, 3)
+        assert np.allclose(out, expected, atol=1e-6), (interpolation, np.abs(out - expected).max())
+
+
+def check_shaper_then_3d(folder):
+    # 1D shaper (square) rows come first, then an identity 3D cube; if the
+    # row blocks were swapped the parsed tables would be nonsense.
+    size_1d = 5
+    size_3d = 3
+    shaper_in = np.linspace(0.0, 1.0, size_1d, dtype=np.float32)
+    shaper_rows = np.repeat((shaper_in ** 2)[:, None], 3, axis=1)
+    path = write_cube(
+        folder,
+        'shaper.cube',
+        [f'LUT_1D_SIZE {size_1d}', f'LUT_3D_SIZE {size_3d}', 'LUT_1D_INPUT_RANGE 0 2'],
+        np.concatenate([shaper_rows, lattice_rgb(size_3d)])
+    )
+    lut = load_cube_lut(path)
+    assert lut['table_1d'].shape == (size_1d, 3) and lut['table_3d'].shape == (size_3d ** 3, 3)
+    rgb = np.array([[[0.0, 0.5, 2.0], [1.0, 1.5, 0.5]]], dtype=np.float32)
+    expected = (rgb / 2.0) ** 2
+    for interpolation in INTERPOLATIONS:
+        out = apply_cube_lut(rgb, lut, interpolation)
+        assert np.allclose(out, expected, atol=1e-6), (interpolation, out, expected)
+
+
+def check_float32_coordinates():
+    pixels = np.random.default_rng(2).random((64, 3), dtype=np.float32)
+    index, frac = lut_coordinates(pixels, compile_lut_domain([0.0] * 3, [1.0] * 3, size=17), 17)
+    assert index.dtype == np.int32 and frac.dtype == np.float32, (index.dtype, frac.dtype)
+
+
+def main():
+    folder = tempfile.mkdtemp(prefix='check_luts_')
+    try:
+        check_identity_3d(folder)
+        check_lattice_points_exact(folder)
+        check_affine_and_ties(folder)
+        check_shaper_then_3d(folder)
+        check_float32_coordinates()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    print("All LUT checks passed")
+
+
+if __name__ == '__main__':
+    main()
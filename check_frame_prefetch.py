@@ -0,0 +1,121 @@
+"""Sanity checks for read-ahead in the shared-memory EXR feeder in app.py.
+
+Runs app.feed_exr_frames_from_shared_memory on small fake frame files with a
+synthetic decode task (no OpenEXR needed) and checks that the prefetcher's
+held bytes stay within its byte budget, that frames still arrive in order,
+and that a missing file is reported with its frame number and path.
+
+Usage:
+    python check_frame_prefetch.py
+"""
+import os
+import shutil
+import tempfile
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import app
+
+FRAME_SHAPE = (4, 8, 3)
+FILE_BYTES = 4096
+
+
+def fill_slot_task(task):
+    """Same task tuple as app.decode_exr_frame_to_slot_task; fills the slot with the file's first byte."""
+    exr_path, exr_buffer_name, exr_size, slot_name, frame_shape, _, slot_index = task
+    exr_buffer = shared_memory.SharedMemory(name=exr_buffer_name)
+    slot = shared_memory.SharedMemory(name=slot_name)
+    try:
+        assert exr_size == FILE_BYTES, (exr_path, exr_size)
+        frame = np.ndarray(frame_shape, dtype=np.uint8, buffer=slot.buf)
+        frame[...] = exr_buffer.buf[0]
+        del frame
+    finally:
+        slot.close()
+        exr_buffer.close()
+    return slot_index
+
+
+class RecordingPrefetcher(app.FramePrefetcher):
+    """FramePrefetcher with a small budget that records the peak of held_bytes."""
+    byte_budget_override = 0
+    peak_held_bytes = 0
+
+    def __init__(self, paths, **kwargs):
+        kwargs['byte_budget'] = self.byte_budget_override
+        super().__init__(paths, **kwargs)
+
+    def __setattr__(self, name, value):
+        if name == 'held_bytes':
+            RecordingPrefetcher.peak_held_bytes = max(RecordingPrefetcher.peak_held_bytes, value)
+        super().__setattr__(name, value)
+
+
+def write_frames(folder, count):
+    os.makedirs(folder, exist_ok=True)
+    source_frames = []
+    for frame_number in range(count):
+        path = os.path.join(folder, f"frame_{frame_number:04d}.exr")
+        with open(path, 'wb') as f:
+            f.write(bytes([frame_number % 256]) * FILE_BYTES)
+        source_frames.append((frame_number, path))
+    return source_frames
+
+
+class Sink:
+    def __init__(self):
+        self.frames = []
+
+    def write(self, data):
+        self.frames.append(bytes(data)[0])
+
+
+def run_feeder(source_frames, byte_budget):
+    RecordingPrefetcher.byte_budget_override = byte_budget
+    RecordingPrefetcher.peak_held_bytes = 0
+    sink = Sink()
+    app.feed_exr_frames_from_shared_memory(
+        sink, source_frames, {}, None, FRAME_SHAPE, prefetch=True, decode_task=fill_slot_task
+    )
+    return sink.frames
+
+
+def check_budget_bounds_held_frames(folder):
+    source_frames = write_frames(folder, 24)
+    expected = [frame_number % 256 for frame_number, _ in source_frames]
+    # A budget smaller than one file still lets a single frame through.
+    for byte_budget in (1, FILE_BYTES, FILE_BYTES * 3):
+        frames = run_feeder(source_frames, byte_budget)
+        assert frames == expected, (byte_budget, frames)
+        peak = RecordingPrefetcher.peak_held_bytes
+        assert peak <= max(byte_budget, FILE_BYTES), (byte_budget, peak)
+
+
+def check_missing_frame_names_path(folder):
+    source_frames = write_frames(folder, 6)
+    missing_number, missing_path = source_frames[3]
+    os.remove(missing_path)
+    try:
+        run_feeder(source_frames, FILE_BYTES * 2)
+    except RuntimeError as e:
+        assert f"frame {missing_number}" in str(e) and missing_path in str(e), str(e)
+    else:
+        raise AssertionError("missing frame was not reported")
+
+
+def main():
+    app.EXR_PREPROCESS_WORKERS = 2
+    app.EXR_SHARED_MEMORY_SLOTS = 6
+    app.FramePrefetcher = RecordingPrefetcher
+    folder = tempfile.mkdtemp(prefix='check_prefetch_')
+    try:
+        check_budget_bounds_held_frames(os.path.join(folder, 'budget'))
+        check_missing_frame_names_path(os.path.join(folder, 'missing'))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    print("All prefetch checks passed")
+
+
+if __name__ == '__main__':
+    main()